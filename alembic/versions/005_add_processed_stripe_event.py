@@ -0,0 +1,27 @@
+"""Add processed_stripe_event dedupe table
+
+Revision ID: 005_add_processed_stripe_event
+Revises: 004_add_payment_models
+Create Date: 2025-01-07 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_add_processed_stripe_event'
+down_revision = '004_add_payment_models'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('processed_stripe_event',
+        sa.Column('id', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('processed_stripe_event')
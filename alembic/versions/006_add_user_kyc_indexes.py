@@ -0,0 +1,40 @@
+"""Add covering and partial KYC indexes on user
+
+Revision ID: 006_add_user_kyc_indexes
+Revises: 005_add_processed_stripe_event
+Create Date: 2025-01-08 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_add_user_kyc_indexes'
+down_revision = '005_add_processed_stripe_event'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Covering index lets the webhook's id -> kyc_status read be served as
+    # an index-only scan, skipping the heap fetch
+    op.create_index(
+        'user_pk_with_kyc',
+        'user',
+        ['id'],
+        postgresql_include=['kyc_status']
+    )
+
+    # Partial index keeps the conditional verified-UPDATE predicate and
+    # unverified-user scans to the (small) unverified subset
+    op.create_index(
+        'user_unverified',
+        'user',
+        ['id'],
+        postgresql_where=sa.text("kyc_status <> 'verified'")
+    )
+
+
+def downgrade():
+    op.drop_index('user_unverified', table_name='user')
+    op.drop_index('user_pk_with_kyc', table_name='user')
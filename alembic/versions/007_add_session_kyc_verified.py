@@ -0,0 +1,36 @@
+"""Add materialized kyc_verified bit to session
+
+Revision ID: 007_add_session_kyc_verified
+Revises: 006_add_user_kyc_indexes
+Create Date: 2025-01-09 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_add_session_kyc_verified'
+down_revision = '006_add_user_kyc_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'session',
+        sa.Column('kyc_verified', sa.Boolean(), nullable=False,
+                  server_default=sa.text('false'))
+    )
+    op.create_index('ix_session_kyc_verified', 'session', ['kyc_verified'])
+
+    # Backfill existing sessions from the current user status
+    op.execute(
+        'UPDATE session SET kyc_verified = true '
+        'FROM "user" u '
+        "WHERE session.user_id = u.id AND u.kyc_status = 'verified'"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_session_kyc_verified', table_name='session')
+    op.drop_column('session', 'kyc_verified')
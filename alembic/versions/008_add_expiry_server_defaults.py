@@ -0,0 +1,31 @@
+"""Add server-side defaults for magic_link and session expiry
+
+Revision ID: 008_add_expiry_server_defaults
+Revises: 007_add_session_kyc_verified
+Create Date: 2025-01-09 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_add_expiry_server_defaults'
+down_revision = '007_add_session_kyc_verified'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column(
+        'magic_link', 'expires_at',
+        server_default=sa.text("now() + interval '5 minutes'")
+    )
+    op.alter_column(
+        'session', 'expires_at',
+        server_default=sa.text("now() + interval '7 days'")
+    )
+
+
+def downgrade():
+    op.alter_column('magic_link', 'expires_at', server_default=None)
+    op.alter_column('session', 'expires_at', server_default=None)
@@ -0,0 +1,28 @@
+"""Add composite index for per-user order listing
+
+Revision ID: 009_add_order_user_created_index
+Revises: 008_add_expiry_server_defaults
+Create Date: 2025-01-09 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009_add_order_user_created_index'
+down_revision = '008_add_expiry_server_defaults'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Backs list_orders' WHERE user_id ... ORDER BY created_at DESC
+    op.create_index(
+        'ix_order_user_created',
+        'orders',
+        ['user_id', sa.text('created_at DESC')]
+    )
+
+
+def downgrade():
+    op.drop_index('ix_order_user_created', table_name='orders')
@@ -0,0 +1,32 @@
+"""Convert payment_intent metadata from text to JSONB
+
+Revision ID: 010_payment_intent_metadata_jsonb
+Revises: 009_add_order_user_created_index
+Create Date: 2025-01-09 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = '010_payment_intent_metadata_jsonb'
+down_revision = '009_add_order_user_created_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column(
+        'payment_intent', 'metadata',
+        type_=JSONB(),
+        postgresql_using='metadata::jsonb'
+    )
+
+
+def downgrade():
+    op.alter_column(
+        'payment_intent', 'metadata',
+        type_=sa.Text(),
+        postgresql_using='metadata::text'
+    )
@@ -0,0 +1,29 @@
+"""Store the total charge in cents on orders
+
+Revision ID: 011_add_order_amount_cents
+Revises: 010_payment_intent_metadata_jsonb
+Create Date: 2025-01-09 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011_add_order_amount_cents'
+down_revision = '010_payment_intent_metadata_jsonb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'orders',
+        sa.Column('amount_cents', sa.Integer(), nullable=True,
+                  comment='Total charge in cents, as sent to Stripe')
+    )
+    op.execute('UPDATE orders SET amount_cents = (total_usd * 100)::int')
+    op.alter_column('orders', 'amount_cents', nullable=False)
+
+
+def downgrade():
+    op.drop_column('orders', 'amount_cents')
@@ -0,0 +1,50 @@
+"""Store order status as smallint instead of the orderstatus enum
+
+Revision ID: 012_order_status_smallint
+Revises: 011_add_order_amount_cents
+Create Date: 2025-01-09 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012_order_status_smallint'
+down_revision = '011_add_order_amount_cents'
+branch_labels = None
+depends_on = None
+
+# Name-to-int mapping matching app.models.payment.OrderStatus
+_STATUSES = [
+    ('DRAFT', 0),
+    ('PAYMENT_PENDING', 1),
+    ('PAYMENT_AUTHORIZED', 2),
+    ('KYC_PENDING', 3),
+    ('PROCESSING', 4),
+    ('COMPLETED', 5),
+    ('FAILED', 6),
+    ('CANCELED', 7),
+]
+
+
+def upgrade():
+    cases = ' '.join(
+        f"WHEN '{name}' THEN {value}" for name, value in _STATUSES
+    )
+    op.execute(
+        'ALTER TABLE orders ALTER COLUMN status TYPE smallint '
+        f'USING (CASE status::text {cases} END)'
+    )
+    op.execute('DROP TYPE IF EXISTS orderstatus')
+
+
+def downgrade():
+    names = ', '.join(f"'{name}'" for name, _ in _STATUSES)
+    op.execute(f'CREATE TYPE orderstatus AS ENUM ({names})')
+    cases = ' '.join(
+        f"WHEN {value} THEN '{name}'" for name, value in _STATUSES
+    )
+    op.execute(
+        'ALTER TABLE orders ALTER COLUMN status TYPE orderstatus '
+        f'USING (CASE status {cases} END)::orderstatus'
+    )
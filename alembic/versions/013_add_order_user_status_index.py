@@ -0,0 +1,25 @@
+"""Add composite index for status-filtered per-user order lookups
+
+Revision ID: 013_add_order_user_status_index
+Revises: 012_order_status_smallint
+Create Date: 2025-01-09 12:00:00.000000
+
+"""
+import alembic.op as op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013_add_order_user_status_index'
+down_revision = '012_order_status_smallint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ix_order_user_created already exists (migration 009); this adds the
+    # (user_id, status) companion for status-filtered scans
+    op.create_index('ix_order_user_status', 'orders', ['user_id', 'status'])
+
+
+def downgrade():
+    op.drop_index('ix_order_user_status', table_name='orders')
@@ -84,12 +84,19 @@ async def get_user_manager(
 bearer_transport = BearerTransport(tokenUrl="/auth/jwt/login")
 
 
+# Single strategy instance shared across requests. FastAPI-Users v14 signs
+# and verifies through PyJWT (cryptography-backed), so the remaining
+# per-request overhead was rebuilding the strategy on every get_strategy
+# call; constructing it once removes that.
+_jwt_strategy = JWTStrategy(
+    secret=settings.jwt_secret,
+    lifetime_seconds=int(timedelta(hours=1).total_seconds()),
+)
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    """Configure JWT strategy with 1-hour access token lifetime."""
-    return JWTStrategy(
-        secret=settings.jwt_secret,
-        lifetime_seconds=int(timedelta(hours=1).total_seconds()),
-    )
+    """Return the shared JWT strategy with 1-hour access token lifetime."""
+    return _jwt_strategy
 
 
 auth_backend = AuthenticationBackend(
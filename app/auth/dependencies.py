@@ -31,16 +31,31 @@ async def current_user(
     
     Raises 401 if no valid session is found.
     """
+    # FastAPI caches dependency results per request, but routes that mix
+    # auth dependencies through different paths can still resolve this
+    # more than once; memoizing on request.state guarantees a single
+    # session + user lookup per request.
+    cached = getattr(request.state, "user", None)
+    if cached is not None:
+        return cached
+
     session_token = SessionService.get_session_token_from_request(request)
-    
+
     if not session_token:
         raise SessionRequiredError()
-    
-    user = await SessionService.get_user_by_session_token(db, session_token)
-    
+
+    session = await SessionService.get_session_by_token(db, session_token)
+
+    if not session:
+        raise InvalidSessionError()
+
+    user = await db.get(User, session.user_id)
+
     if not user:
         raise InvalidSessionError()
-    
+
+    request.state.session = session
+    request.state.user = user
     return user
 
 
@@ -66,6 +81,7 @@ async def current_active_user(
 
 
 async def current_verified_user(
+    request: Request,
     user: User = Depends(current_active_user)
 ) -> User:
     """
@@ -74,6 +90,12 @@ async def current_verified_user(
     This creates a security gate for sensitive operations requiring identity verification.
     Raises 401 if not authenticated, 403 if user is inactive or not KYC verified.
     """
+    # Fast path: the session row carries a materialized copy of the gate,
+    # stamped at login and kept in sync by the KYC webhook
+    session = getattr(request.state, "session", None)
+    if session is not None and session.kyc_verified:
+        return user
+
     if user.kyc_status != KYCStatus.verified:
         raise HTTPException(
             status_code=403,
@@ -165,7 +165,7 @@ async def redeem_magic_link(
         response_data = {
             "message": "Authentication successful",
             "user": {
-                "id": str(user.id),
+                "id": user.id_str,
                 "email": user.email,
                 "is_verified": user.is_verified,
                 "kyc_status": user.kyc_status.value
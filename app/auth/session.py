@@ -15,6 +15,7 @@ Features:
 
 import secrets
 import string
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Literal, Optional
 from uuid import UUID
@@ -23,10 +24,17 @@ from fastapi import Request, Response, HTTPException
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import User
+from app.models.user import User, KYCStatus
 from app.models.session import Session
 
 
+# Coarse-grained touch tracking: last_accessed_at is written at most once
+# per interval per token. Every authenticated request resolves a session,
+# and an UPDATE per request is pure write amplification.
+_LAST_TOUCH: dict[str, float] = {}
+_TOUCH_INTERVAL_SECONDS = 60.0
+
+
 class SessionService:
     """Service class for session management operations."""
     
@@ -62,13 +70,15 @@ class SessionService:
         client_ip = request.client.host if request.client else None
         user_agent = request.headers.get("user-agent")
         
-        # Create new session
+        # Create new session, stamping the materialized KYC gate so
+        # verified routes can check the session row alone
         session = Session(
             session_token=session_token,
             user_id=user.id,
             ip_address=client_ip,
             user_agent=user_agent,
-            expires_at=datetime.now(timezone.utc) + timedelta(days=expires_in_days)
+            expires_at=datetime.now(timezone.utc) + timedelta(days=expires_in_days),
+            kyc_verified=user.kyc_status == KYCStatus.verified
         )
         
         db.add(session)
@@ -102,11 +112,16 @@ class SessionService:
             await db.commit()
             return None
         
-        # Update last accessed time
+        # Update last accessed time, coarsened to one write per interval
         if touch:
-            session.touch()
-            db.add(session)
-            await db.commit()
+            now = time.monotonic()
+            if now - _LAST_TOUCH.get(session_token, 0.0) > _TOUCH_INTERVAL_SECONDS:
+                if len(_LAST_TOUCH) > 10_000:
+                    _LAST_TOUCH.clear()
+                _LAST_TOUCH[session_token] = now
+                session.touch()
+                db.add(session)
+                await db.commit()
         
         return session
     
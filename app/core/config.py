@@ -79,6 +79,12 @@ class Settings(BaseSettings):
         description="Stripe webhook signing secret for webhook verification",
     )
     
+    database_use_pgbouncer: bool = Field(
+        default=False,
+        description="Route database traffic through PGBouncer transaction "
+                    "pooling instead of SQLAlchemy's in-process pool",
+    )
+
     # Optional Configuration
     environment: Environment = Field(
         default=Environment.DEVELOPMENT,
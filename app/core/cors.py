@@ -0,0 +1,77 @@
+"""
+Minimal ASGI CORS Middleware
+
+This module provides a small CORS middleware specialized for a fixed,
+known-ahead-of-time origin allow-list. Starlette's CORSMiddleware scans its
+allow-list and rebuilds header lists on every request; with a precomputed
+frozenset of origins the check becomes a single hash lookup, and preflight
+requests are answered with prebuilt headers before route matching runs.
+"""
+
+from typing import Iterable
+
+
+class FastCORS:
+    """ASGI middleware serving CORS from a precomputed origin set."""
+
+    def __init__(self, app, allow_origins: Iterable[str]) -> None:
+        self.app = app
+        # Header values are latin-1 per the ASGI spec
+        self.allow_origins = frozenset(
+            origin.encode("latin-1") for origin in allow_origins
+        )
+        self.base_preflight_headers = (
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-max-age", b"600"),
+            (b"vary", b"origin"),
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        allowed = origin in self.allow_origins
+
+        # Preflight: answer directly without entering the router
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = list(self.base_preflight_headers)
+            if allowed:
+                headers.append((b"access-control-allow-origin", origin))
+                headers.append((b"access-control-allow-methods", request_method))
+                if request_headers:
+                    headers.append((b"access-control-allow-headers", request_headers))
+            await send({
+                "type": "http.response.start",
+                "status": 204 if allowed else 400,
+                "headers": headers,
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        # Simple request from an unknown (or absent) origin: pass through
+        # untouched; the browser enforces the missing allow-origin header
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = message.setdefault("headers", [])
+                headers.append((b"access-control-allow-origin", origin))
+                headers.append((b"access-control-allow-credentials", b"true"))
+                headers.append((b"vary", b"origin"))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
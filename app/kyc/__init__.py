@@ -9,24 +9,31 @@ The system ensures idempotent webhook processing and maintains audit trails
 through session ID tracking.
 """
 
-import json
+import asyncio
 import logging
 import hmac
 import hashlib
+import re
+import time
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict
+from urllib.parse import urlsplit
 from uuid import UUID
 
+import orjson
 import stripe
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from app.auth.dependencies import current_active_user, current_verified_user
 from app.core.config import get_settings
-from app.db import get_session
+from app.db import AsyncSessionLocal, get_session
 from app.models.user import User, KYCStatus
-from app.models.payment import Order, PaymentIntent, OrderStatus, PaymentStatus
+from app.models.payment import Order, PaymentIntent, OrderStatus, PaymentStatus, ProcessedStripeEvent
+from app.models.session import Session
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -35,6 +42,44 @@ settings = get_settings()
 # Configure Stripe with the secret key
 stripe.api_key = settings.stripe_secret.get_secret_value()
 
+# Bound once at import: the webhook secret is needed on every delivery and
+# pre-encoding skips the settings attribute chain and UTF-8 encode per call
+_WEBHOOK_SECRET = settings.stripe_webhook_secret.get_secret_value().encode("utf-8")
+_VERIFIED_EVENT = "identity.verification_session.verified"
+
+# Post-verification return URLs keyed by exact request host. Exact-host
+# matching avoids the open-redirect risk of substring checks while keeping
+# the lookup to a single dict hit per request.
+_RETURN_URLS = {
+    "ultracivic.com": "https://ultracivic.com/dashboard.html",
+    "localhost": "http://localhost:8080/dashboard.html",
+}
+_DEFAULT_RETURN_URL = "https://ultracivic.com/dashboard.html"
+
+# Canonical lowercase UUID, as produced by str(uuid4()) when the
+# verification session was created
+_UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+)
+
+# Maximum allowed age of a webhook signature timestamp, mirroring the
+# tolerance stripe.Webhook.construct_event applies, to block replays
+_SIGNATURE_TOLERANCE_SECONDS = 300
+
+# Quoted event-type strings for every event the handlers below act on.
+# Used as a bytes-level prefilter on the raw payload: any other event
+# type is ACKed without ever being JSON-parsed. The quotes keep the
+# markers from matching the "object" field of nested payload objects.
+_HANDLED_EVENT_MARKERS = (
+    b'"identity.verification_session.verified"',
+    b'"identity.verification_session.requires_input"',
+    b'"identity.verification_session.canceled"',
+    b'"payment_intent.requires_capture"',
+    b'"payment_intent.succeeded"',
+    b'"payment_intent.canceled"',
+    b'"payment_intent.payment_failed"',
+)
+
 
 @router.post("/kyc/start")
 async def start_kyc_verification(
@@ -49,28 +94,23 @@ async def start_kyc_verification(
     identity verification. Sets user status to PENDING during verification.
     """
     try:
-        # Determine return URL based on request origin
-        origin = request.headers.get("origin", "")
-        referer = request.headers.get("referer", "")
-        
-        if "ultracivic.com" in origin:
-            return_url = "https://ultracivic.com/dashboard.html"
-        elif "ultracivic.com" in referer:
-            return_url = "https://ultracivic.com/dashboard.html"
-        elif "localhost" in origin:
-            return_url = "http://localhost:8080/dashboard.html"
-        else:
-            return_url = "https://ultracivic.com/dashboard.html"  # Default to production
-        
+        # Determine return URL from the exact request host
+        origin = request.headers.get("origin") or request.headers.get("referer") or ""
+        host = urlsplit(origin).hostname or ""
+        return_url = _RETURN_URLS.get(host, _DEFAULT_RETURN_URL)
+
         logger.info("Using return URL: %s for origin: %s", return_url, origin)
         
-        # Create Stripe Identity verification session
-        session = stripe.identity.VerificationSession.create(
+        # Create Stripe Identity verification session. The stripe SDK is
+        # synchronous; running it on a worker thread keeps the Stripe HTTPS
+        # round-trip (~100-300ms) from blocking the event loop.
+        session = await asyncio.to_thread(
+            stripe.identity.VerificationSession.create,
             type="document",
-            client_reference_id=str(user.id),
+            client_reference_id=user.id_str,
             metadata={
                 "user_email": user.email,
-                "user_id": str(user.id),
+                "user_id": user.id_str,
             },
             return_url=return_url,
             # Configure for test mode to allow testing
@@ -85,32 +125,47 @@ async def start_kyc_verification(
         # Update user with session ID and set status to PENDING
         user.stripe_verification_session_id = session.id
         user.kyc_status = KYCStatus.pending
-        db.add(user)
+
+        # Restarting verification takes the user out of "verified", so the
+        # materialized session gate must drop with it — otherwise
+        # current_verified_user's fast path would keep honoring the stale
+        # bit until a webhook arrives (possibly never, if the user
+        # abandons the flow)
+        await db.execute(
+            update(Session)
+            .where(Session.user_id == user.id)
+            .values(kyc_verified=False)
+        )
         await db.commit()
+
+        # Keep the copy cached on this request coherent too
+        auth_session = getattr(request.state, "session", None)
+        if auth_session is not None:
+            auth_session.kyc_verified = False
         
         logger.info(
             "Created verification session %s for user %s", 
             session.id, 
-            str(user.id)
+            user.id
         )
         
         return {"url": session.url}
         
     except stripe.StripeError as e:
-        logger.error("Stripe error creating verification session: %s", str(e))
+        logger.error("Stripe error creating verification session: %s", e)
         raise HTTPException(
             status_code=500, 
             detail="Failed to create verification session"
         )
     except Exception as e:
-        logger.error("Unexpected error creating verification session: %s", str(e))
+        logger.error("Unexpected error creating verification session: %s", e)
         raise HTTPException(
             status_code=500, 
             detail="Internal server error"
         )
 
 
-def verify_webhook_signature(payload: bytes, signature: str, secret: str) -> bool:
+def verify_webhook_signature(payload: bytes, signature: str, secret: bytes) -> bool:
     """
     Verify Stripe webhook signature to ensure request authenticity.
     
@@ -134,26 +189,32 @@ def verify_webhook_signature(payload: bytes, signature: str, secret: str) -> boo
         if not timestamp or not signatures:
             return False
         
-        # Create expected signature
-        signed_payload = f"{timestamp}.{payload.decode('utf-8')}"
-        expected_signature = hmac.new(
-            secret.encode('utf-8'),
-            signed_payload.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        # Reject stale timestamps to prevent replay of captured payloads
+        if abs(time.time() - int(timestamp)) > _SIGNATURE_TOLERANCE_SECONDS:
+            return False
         
-        # Verify signature matches
-        return any(
-            hmac.compare_digest(expected_signature, sig) 
-            for sig in signatures
-        )
+        # Create expected signature as raw bytes (32-byte digest instead
+        # of a 64-char hex string halves the constant-time comparison)
+        signed_payload = f"{timestamp}.".encode("utf-8") + payload
+        expected_digest = hmac.new(
+            secret,
+            signed_payload,
+            hashlib.sha256
+        ).digest()
+
+        # Verify signature matches (Stripe sends a single v1 signature in
+        # practice, so this loop normally runs once)
+        for sig in signatures:
+            if hmac.compare_digest(expected_digest, bytes.fromhex(sig)):
+                return True
+        return False
         
     except Exception as e:
-        logger.error("Error verifying webhook signature: %s", str(e))
+        logger.error("Error verifying webhook signature: %s", e)
         return False
 
 
-async def capture_user_payments(db: AsyncSession, user: User) -> None:
+async def capture_user_payments(db: AsyncSession, user_id: UUID) -> None:
     """
     Capture all authorized payments for a user after KYC verification.
     
@@ -161,11 +222,15 @@ async def capture_user_payments(db: AsyncSession, user: User) -> None:
     associated PaymentIntents, then updates order status to PROCESSING.
     """
     try:
-        # Find all orders with authorized payments
+        # Find all orders with authorized payments, locking the rows so a
+        # concurrently delivered webhook cannot double-capture; skip_locked
+        # lets the other worker see zero rows and exit without blocking
+        # raiseload guards against accidental relationship lazy-loads; the
+        # PaymentIntent rows are fetched explicitly below
         stmt = select(Order).where(
-            Order.user_id == user.id,
+            Order.user_id == user_id,
             Order.status == OrderStatus.PAYMENT_AUTHORIZED
-        )
+        ).options(raiseload("*")).with_for_update(skip_locked=True)
         result = await db.execute(stmt)
         orders = result.scalars().all()
         
@@ -179,9 +244,10 @@ async def capture_user_payments(db: AsyncSession, user: User) -> None:
             payment_intent = result.scalar_one_or_none()
             
             if payment_intent:
-                # Capture the payment
+                # Capture the payment, off the event loop
                 try:
-                    stripe_intent = stripe.PaymentIntent.capture(
+                    stripe_intent = await asyncio.to_thread(
+                        stripe.PaymentIntent.capture,
                         payment_intent.stripe_payment_intent_id
                     )
                     
@@ -193,234 +259,282 @@ async def capture_user_payments(db: AsyncSession, user: User) -> None:
                     # Update order status to processing
                     order.status = OrderStatus.PROCESSING
                     
-                    db.add(payment_intent)
-                    db.add(order)
-                    
                     logger.info(
                         "Captured payment %s for order %s after KYC verification",
                         payment_intent.stripe_payment_intent_id,
-                        str(order.id)
+                        order.id
                     )
                     
                 except stripe.StripeError as e:
                     logger.error(
                         "Failed to capture payment %s: %s", 
                         payment_intent.stripe_payment_intent_id,
-                        str(e)
+                        e
                     )
                     # Mark order as failed
                     order.status = OrderStatus.FAILED
-                    db.add(order)
         
         await db.commit()
         
     except Exception as e:
-        logger.error("Error capturing user payments after KYC: %s", str(e))
+        logger.error("Error capturing user payments after KYC: %s", e)
         await db.rollback()
 
 
+async def process_stripe_event_task(event: dict) -> None:
+    """
+    Apply a Stripe webhook event's side effects off the request path.
+
+    Runs as a background task with its own session; the webhook route has
+    already ACKed Stripe by the time this executes. The event-ID dedupe
+    claim keeps retried deliveries idempotent even if a task is lost.
+    """
+    async with AsyncSessionLocal() as db:
+        # Claim the event ID before doing any work: Stripe retries
+        # deliveries aggressively, and a duplicate should cost one
+        # INSERT ... ON CONFLICT instead of user/payment round-trips. The
+        # claim is committed together with the handler's own commit, so an
+        # aborted handler leaves the event unclaimed and safe to retry.
+        event_id = event.get("id")
+        if event_id:
+            claim = (
+                pg_insert(ProcessedStripeEvent)
+                .values(id=event_id)
+                .on_conflict_do_nothing()
+                .returning(ProcessedStripeEvent.id)
+            )
+            claimed = (await db.execute(claim)).scalar_one_or_none()
+            if claimed is None:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Duplicate Stripe event %s, skipping", event_id)
+                return
+
+        # Handle verification session events
+        if event["type"].startswith("identity.verification_session."):
+            await handle_verification_session_event(event, db)
+
+        # Handle payment intent events
+        elif event["type"].startswith("payment_intent."):
+            await handle_payment_intent_event(event, db)
+
+
 @router.post("/webhooks/stripe")
 async def handle_stripe_webhook(
     request: Request,
-    db: AsyncSession = Depends(get_session)
-) -> Dict[str, Any]:
+    background: BackgroundTasks
+) -> Response:
     """
     Handle Stripe webhook events for identity verification.
     
-    Processes verification session events and updates user KYC status.
-    Ensures idempotent processing to handle duplicate events safely.
+    Verifies the signature, then ACKs immediately and applies the event's
+    state changes in a background task so webhook latency stays at HMAC
+    verification plus one enqueue. Duplicate deliveries are deduped by
+    event ID inside the task.
     """
     payload = await request.body()
     signature = request.headers.get("stripe-signature", "")
     
     # Verify webhook signature
-    webhook_secret = settings.stripe_webhook_secret.get_secret_value()
-    if not verify_webhook_signature(payload, signature, webhook_secret):
+    if not verify_webhook_signature(payload, signature, _WEBHOOK_SECRET):
         logger.error("Invalid webhook signature received")
         raise HTTPException(status_code=400, detail="Invalid signature")
-    
+
+    # Cheap bytes-level peek: skip full parsing and Event construction for
+    # event types this module never handles. Safe because the payload was
+    # already authenticated by the signature check above.
+    if not any(marker in payload for marker in _HANDLED_EVENT_MARKERS):
+        return Response(status_code=200)
+
     try:
-        # Parse the webhook event
-        event = stripe.Event.construct_from(
-            json.loads(payload.decode('utf-8')),
-            stripe.api_key
-        )
-    except Exception as e:
-        logger.error("Error parsing webhook payload: %s", str(e))
+        # Parse the authenticated payload with orjson; the handlers only
+        # need a handful of fields, so skipping stripe.Event construction
+        # (which wraps every nested dict in a StripeObject) avoids a second
+        # full traversal of the ~5KB payload
+        event = orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
+        logger.error("Error parsing webhook payload: %s", e)
         raise HTTPException(status_code=400, detail="Invalid payload")
     
-    logger.info("Processing webhook event: %s", event.type)
-    
-    # Handle verification session events
-    if event.type.startswith("identity.verification_session."):
-        return await handle_verification_session_event(event, db)
-    
-    # Handle payment intent events
-    if event.type.startswith("payment_intent."):
-        return await handle_payment_intent_event(event, db)
-    
-    # Return success for unhandled events
-    return {"received": True}
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Processing webhook event: %s", event["type"])
+
+    background.add_task(process_stripe_event_task, event)
+    return Response(status_code=200)
 
 
 async def handle_verification_session_event(
-    event: stripe.Event,
+    event: dict,
     db: AsyncSession
-) -> Dict[str, Any]:
+) -> None:
     """
     Process verification session events and update user status.
     
     Handles verified, requires_input, and canceled events.
     Uses session ID for idempotent processing.
     """
-    session_data = event.data.object
-    session_id = session_data.id
+    session_data = event["data"]["object"]
+    session_id = session_data["id"]
     
-    try:
-        # Extract user ID from client_reference_id
-        user_id = UUID(session_data.client_reference_id)
-    except (ValueError, KeyError, TypeError) as e:
-        logger.error("Invalid client_reference_id in webhook: %s", str(e))
-        return {"received": True, "error": "invalid_client_reference_id"}
+    # Pre-validate client_reference_id with a compiled regex so malformed
+    # input (attack traffic, test events) short-circuits without paying for
+    # CPython exception machinery; UUID() cannot raise after a regex match
+    ref = session_data.get("client_reference_id")
+    if not ref or not _UUID_RE.match(ref):
+        logger.error("Invalid client_reference_id in webhook: %r", ref)
+        return
+    user_id = UUID(ref)
     
-    # Find user by ID
+    # Update user based on event type
+    if event["type"] == _VERIFIED_EVENT:
+        # Single conditional UPDATE: marks the user verified only if they
+        # are not already, making the idempotency check atomic with the
+        # write and skipping the SELECT entirely
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.kyc_status != KYCStatus.verified)
+            .values(
+                kyc_status=KYCStatus.verified,
+                stripe_verification_session_id=session_id,
+            )
+            .returning(User.id)
+        )
+        updated = (await db.execute(stmt)).scalar_one_or_none()
+        if updated is not None:
+            # Refresh the materialized gate on the user's live sessions
+            await db.execute(
+                update(Session)
+                .where(Session.user_id == user_id)
+                .values(kyc_verified=True)
+            )
+        await db.commit()
+
+        if updated is None:
+            logger.info(
+                "Session %s already processed (or user %s unknown)",
+                session_id,
+                user_id
+            )
+            return
+
+        logger.info("Verification successful for user %s, session %s", user_id, session_id)
+
+        # Capture any authorized payments; we are already off the request
+        # path, so this no longer delays the webhook ACK
+        await capture_user_payments(db, user_id)
+        return
+
+    # Find user by ID for the remaining event types
     user = await db.get(User, user_id)
     if not user:
         logger.warning("User %s not found for verification session %s", user_id, session_id)
-        return {"received": True, "error": "user_not_found"}
-    
-    # Check if this session was already processed (idempotency)
-    if (user.stripe_verification_session_id == session_id and 
-        event.type == "identity.verification_session.verified" and
-        user.kyc_status == KYCStatus.verified):
-        logger.info("Session %s already processed for user %s", session_id, user_id)
-        return {"received": True, "status": "already_processed"}
-    
-    # Update user based on event type
-    if event.type == "identity.verification_session.verified":
-        logger.info("Verification successful for user %s, session %s", user_id, session_id)
-        user.kyc_status = KYCStatus.verified
-        user.stripe_verification_session_id = session_id
-        status = "verified"
-        
-        # Capture any authorized payments for this user
-        await capture_user_payments(db, user)
-        
-    elif event.type == "identity.verification_session.requires_input":
+        return
+
+    if event["type"] == "identity.verification_session.requires_input":
         logger.info("Verification requires input for user %s, session %s", user_id, session_id)
         user.kyc_status = KYCStatus.failed
         user.stripe_verification_session_id = session_id
         status = "requires_input"
         
-    elif event.type == "identity.verification_session.canceled":
+    elif event["type"] == "identity.verification_session.canceled":
         logger.info("Verification canceled for user %s, session %s", user_id, session_id)
         user.kyc_status = KYCStatus.unverified
         user.stripe_verification_session_id = session_id
         status = "canceled"
         
     else:
-        logger.info("Unhandled verification session event: %s", event.type)
-        return {"received": True, "status": "unhandled"}
+        logger.info("Unhandled verification session event: %s", event["type"])
+        return
+
+    # Keep the materialized session gate in sync with the downgrade
+    await db.execute(
+        update(Session)
+        .where(Session.user_id == user_id)
+        .values(kyc_verified=False)
+    )
     
     # Save changes to database
-    db.add(user)
     await db.commit()
     
-    logger.info(
-        "Updated user %s KYC status to %s for session %s", 
-        user_id, 
-        status,
-        session_id
-    )
-    
-    return {
-        "received": True,
-        "status": status,
-        "user_id": str(user_id),
-        "kyc_status": status
-    }
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Updated user %s KYC status to %s for session %s", 
+            user_id, 
+            status,
+            session_id
+        )
 
 
 async def handle_payment_intent_event(
-    event: stripe.Event,
+    event: dict,
     db: AsyncSession
-) -> Dict[str, Any]:
+) -> None:
     """
     Handle PaymentIntent webhook events to update order status.
     
     Updates order status based on payment authorization and capture events.
     """
-    payment_intent_data = event.data.object
-    payment_intent_id = payment_intent_data.id
+    payment_intent_data = event["data"]["object"]
+    payment_intent_id = payment_intent_data["id"]
     
     try:
-        # Find PaymentIntent record
-        stmt = select(PaymentIntent).where(
-            PaymentIntent.stripe_payment_intent_id == payment_intent_id
+        # Find PaymentIntent and its order in a single joined query
+        stmt = (
+            select(PaymentIntent, Order)
+            .join(Order, PaymentIntent.order_id == Order.id)
+            .where(PaymentIntent.stripe_payment_intent_id == payment_intent_id)
         )
         result = await db.execute(stmt)
-        payment_intent = result.scalar_one_or_none()
-        
-        if not payment_intent:
+        row = result.one_or_none()
+
+        if not row:
             logger.warning("PaymentIntent %s not found in database", payment_intent_id)
-            return {"received": True, "error": "payment_intent_not_found"}
-        
+            return
+
+        payment_intent, order = row
+
         # Update payment intent status
         old_status = payment_intent.status
-        payment_intent.status = PaymentStatus(payment_intent_data.status)
-        
-        # Get associated order
-        order = await db.get(Order, payment_intent.order_id)
-        if not order:
-            logger.warning("Order %s not found for PaymentIntent %s", payment_intent.order_id, payment_intent_id)
-            return {"received": True, "error": "order_not_found"}
-        
+        payment_intent.status = PaymentStatus(payment_intent_data["status"])
+
         # Update order status based on payment status
-        if event.type == "payment_intent.requires_capture":
+        if event["type"] == "payment_intent.requires_capture":
             # Payment authorized, waiting for capture
             order.status = OrderStatus.PAYMENT_AUTHORIZED
-            logger.info("Payment authorized for order %s", str(order.id))
+            logger.info("Payment authorized for order %s", order.id)
             
-        elif event.type == "payment_intent.succeeded":
+        elif event["type"] == "payment_intent.succeeded":
             # Payment captured successfully
             order.status = OrderStatus.PROCESSING
             payment_intent.captured_at = datetime.now(timezone.utc)
-            logger.info("Payment captured for order %s", str(order.id))
+            logger.info("Payment captured for order %s", order.id)
             
-        elif event.type == "payment_intent.canceled":
+        elif event["type"] == "payment_intent.canceled":
             # Payment canceled
             order.status = OrderStatus.CANCELED
-            logger.info("Payment canceled for order %s", str(order.id))
+            logger.info("Payment canceled for order %s", order.id)
             
-        elif event.type == "payment_intent.payment_failed":
+        elif event["type"] == "payment_intent.payment_failed":
             # Payment failed
             order.status = OrderStatus.FAILED
-            logger.info("Payment failed for order %s", str(order.id))
+            logger.info("Payment failed for order %s", order.id)
         
         # Save changes
-        db.add(payment_intent)
-        db.add(order)
         await db.commit()
         
-        logger.info(
-            "Updated PaymentIntent %s status: %s → %s, Order %s status: %s",
-            payment_intent_id,
-            old_status.value if old_status else "None",
-            payment_intent.status.value,
-            str(order.id),
-            order.status.value
-        )
-        
-        return {
-            "received": True,
-            "payment_intent_id": payment_intent_id,
-            "order_id": str(order.id),
-            "status": payment_intent.status.value
-        }
+        # Guarded: the enum .value reads are eager argument preparation
+        # that %-formatting cannot defer
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Updated PaymentIntent %s status: %s → %s, Order %s status: %s",
+                payment_intent_id,
+                old_status.value if old_status else "None",
+                payment_intent.status.value,
+                order.id,
+                order.status.label
+            )
         
     except Exception as e:
-        logger.error("Error handling PaymentIntent event %s: %s", payment_intent_id, str(e))
-        return {"received": True, "error": str(e)}
+        logger.error("Error handling PaymentIntent event %s: %s", payment_intent_id, e)
 
 
 @router.get("/kyc/verified-only")
@@ -428,7 +542,7 @@ async def verified_only_endpoint(user: User = Depends(current_verified_user)):
     """Test endpoint demonstrating KYC verification requirement."""
     return {
         "message": "Success! You are a verified user.",
-        "user_id": str(user.id),
+        "user_id": user.id_str,
         "email": user.email,
         "kyc_status": user.kyc_status.value,
         "session_id": user.stripe_verification_session_id
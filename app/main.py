@@ -10,10 +10,14 @@ by magic links with session-based state, KYC verification integrates with
 Stripe Identity, and all database operations use async SQLAlchemy with PostgreSQL.
 """
 
+import time
 from datetime import datetime, timezone
-from fastapi import FastAPI, Depends
-from fastapi.middleware.cors import CORSMiddleware
+
+import orjson
+from fastapi import APIRouter, FastAPI, Depends, Response
+from fastapi.responses import ORJSONResponse
 from app.core.config import get_settings
+from app.core.cors import FastCORS
 from app.auth.dependencies import current_active_user, current_verified_user
 from app.auth.magic_link_router import router as magic_link_router
 from app.models.user import User
@@ -21,11 +25,12 @@ from app.kyc import router as kyc_router
 from app.payments import router as payments_router
 
 settings = get_settings()
-app = FastAPI(title="Ultra Civic Backend")
+app = FastAPI(title="Ultra Civic Backend", default_response_class=ORJSONResponse)
 
-# Configure CORS
+# Configure CORS with a precomputed origin set; preflights short-circuit
+# before route matching
 app.add_middleware(
-    CORSMiddleware,
+    FastCORS,
     allow_origins=[
         "http://localhost:8080",  # Local development (frontend-stub)
         "http://localhost:3000",  # Local development (main website)
@@ -33,35 +38,33 @@ app.add_middleware(
         "https://frontend-stub.ultracivic.pages.dev",  # Cloudflare Pages preview
         "https://ultracivic-backend.onrender.com",  # Render backend (for API docs)
     ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
 )
 
 
-@app.get("/health", tags=["meta"])
-def health_check():
-    """Simple health check endpoint returning application status."""
-    return {
-        "status": "ok",
-        "environment": settings.environment.value,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
-
-
-# Include magic-link authentication routes
-app.include_router(magic_link_router, tags=["auth"])
+# Health responses are identical within a one-second window, so the body is
+# serialized at most once per second instead of on every probe hit
+_HEALTH_STATIC = {"status": "ok", "environment": settings.environment.value}
+_health_cache: tuple[int, bytes] = (0, b"")
 
-app.include_router(kyc_router, tags=["kyc"])
 
-app.include_router(payments_router, tags=["payments"])
+@app.get("/health", tags=["meta"])
+def health_check() -> Response:
+    """Simple health check endpoint returning application status."""
+    global _health_cache
+    now = int(time.time())
+    if _health_cache[0] != now:
+        _health_cache = (now, orjson.dumps({
+            **_HEALTH_STATIC,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }))
+    return Response(content=_health_cache[1], media_type="application/json")
 
 
 @app.get("/me", tags=["auth"])
 async def read_me(user: User = Depends(current_active_user)):
     """Return the currently authenticated user's profile information."""
     return {
-        "id": str(user.id),
+        "id": user.id_str,
         "email": user.email,
         "is_verified": user.is_verified,
         "is_active": user.is_active,
@@ -75,7 +78,19 @@ async def test_verified_access(user: User = Depends(current_verified_user)):
     """Test endpoint that requires KYC verification - demonstrates the security gate."""
     return {
         "message": "Access granted - user is KYC verified",
-        "user_id": str(user.id),
+        "user_id": user.id_str,
         "email": user.email,
         "kyc_status": user.kyc_status.value
     }
+
+
+# Assemble the feature routers into one APIRouter and mount it once, after
+# the hot app-level routes above: Starlette matches routes by linear scan,
+# so /health and /me stay at the front of the route table, and the app's
+# route tree is rebuilt a single time instead of once per include.
+api_router = APIRouter()
+api_router.include_router(magic_link_router, tags=["auth"])
+api_router.include_router(kyc_router, tags=["kyc"])
+api_router.include_router(payments_router, tags=["payments"])
+
+app.include_router(api_router)
@@ -9,11 +9,11 @@ The model tracks creation, expiration, usage, and optional security binding
 to IP address and User-Agent for enhanced security.
 """
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, String, Boolean, ForeignKey
+from sqlalchemy import DateTime, String, Boolean, ForeignKey, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlmodel import SQLModel
 
@@ -54,6 +54,7 @@ class MagicLink(Base):
     
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        server_default=text("now() + interval '5 minutes'"),
         nullable=False,
         comment="When the magic link expires (5 minutes from creation)"
     )
@@ -92,13 +93,8 @@ class MagicLink(Base):
         comment="URL to redirect to after successful authentication"
     )
     
-    # Relationship
-    user: Mapped["User"] = relationship(back_populates="magic_links")
-
-    def __init__(self, **kwargs):
-        if "expires_at" not in kwargs:
-            kwargs["expires_at"] = datetime.now(timezone.utc) + timedelta(minutes=5)
-        super().__init__(**kwargs)
+    # Relationship; never traversed in app code, so implicit loads raise
+    user: Mapped["User"] = relationship(back_populates="magic_links", lazy="raise")
     
     @property
     def is_expired(self) -> bool:
@@ -8,15 +8,20 @@ before KYC and capture occurs after verification.
 
 from datetime import datetime, timezone
 from decimal import Decimal
-from enum import Enum
-from typing import Optional
+from functools import cached_property
+from enum import Enum, IntEnum
+from typing import Optional, TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import String, Integer, DECIMAL, DateTime, Text, ForeignKey, Enum as SAEnum
+from sqlalchemy import String, Integer, SmallInteger, DECIMAL, DateTime, Text, ForeignKey, Enum as SAEnum, Index, TypeDecorator, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.user import Base
 
+if TYPE_CHECKING:
+    from app.models.user import User
+
 
 class PaymentStatus(str, Enum):
     """Payment status values matching Stripe PaymentIntent statuses."""
@@ -29,16 +34,39 @@ class PaymentStatus(str, Enum):
     SUCCEEDED = "succeeded"
 
 
-class OrderStatus(str, Enum):
-    """Order processing status."""
-    DRAFT = "draft"
-    PAYMENT_PENDING = "payment_pending"
-    PAYMENT_AUTHORIZED = "payment_authorized"
-    KYC_PENDING = "kyc_pending"
-    PROCESSING = "processing"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    CANCELED = "canceled"
+class OrderStatus(IntEnum):
+    """Order processing status.
+
+    Integer-valued and stored as SMALLINT: status checks on the payment
+    path become single int compares, and the column is 2 bytes instead of
+    an enum varchar. PaymentStatus stays a str enum because its values are
+    Stripe's wire strings.
+    """
+    DRAFT = 0
+    PAYMENT_PENDING = 1
+    PAYMENT_AUTHORIZED = 2
+    KYC_PENDING = 3
+    PROCESSING = 4
+    COMPLETED = 5
+    FAILED = 6
+    CANCELED = 7
+
+    @property
+    def label(self) -> str:
+        """Human-readable form used in API responses and messages."""
+        return self.name.lower()
+
+
+class OrderStatusType(TypeDecorator):
+    """Maps OrderStatus to SMALLINT, restoring the enum on load."""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else int(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else OrderStatus(value)
 
 
 class Order(Base):
@@ -50,6 +78,13 @@ class Order(Base):
     across the progressive KYC workflow.
     """
     __tablename__ = "orders"
+    __table_args__ = (
+        # Backs list_orders' ordered per-user scan (created in migration 009)
+        Index("ix_order_user_created", "user_id", text("created_at DESC")),
+        # Backs status-filtered per-user lookups, e.g. the KYC capture
+        # sweep over PAYMENT_AUTHORIZED orders and future dashboards
+        Index("ix_order_user_status", "user_id", "status"),
+    )
     
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"), nullable=False)
@@ -59,6 +94,11 @@ class Order(Base):
     amount_usd: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
     fee_usd: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
     total_usd: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
+    amount_cents: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Total charge in cents, as sent to Stripe",
+    )
     
     # Token delivery
     eth_address: Mapped[Optional[str]] = mapped_column(String(42), nullable=True)
@@ -66,7 +106,7 @@ class Order(Base):
     
     # Status tracking
     status: Mapped[OrderStatus] = mapped_column(
-        SAEnum(OrderStatus, name="orderstatus", create_type=False),
+        OrderStatusType,
         default=OrderStatus.DRAFT
     )
     
@@ -74,12 +114,33 @@ class Order(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @cached_property
+    def id_str(self) -> str:
+        """String form of the UUID primary key, built once per instance.
+
+        Mirrors User.id_str: responses, logs, and Stripe metadata stringify
+        the order id several times per request.
+        """
+        return str(self.id)
     
-    # Relationships (forward references for type checking)
-    if False:  # Type checking only
-        from app.models.user import User
-        user: Mapped["User"] = relationship("User", back_populates="orders")
-        payment_intent: Mapped[Optional["PaymentIntent"]] = relationship("PaymentIntent", back_populates="order", uselist=False)
+    # Relationships; never traversed in app code, so implicit loads raise
+    user: Mapped["User"] = relationship(back_populates="orders", lazy="raise")
+    payment_intent: Mapped[Optional["PaymentIntent"]] = relationship(back_populates="order", uselist=False, lazy="raise")
+
+
+class ProcessedStripeEvent(Base):
+    """
+    Dedupe ledger for Stripe webhook deliveries.
+
+    Stripe retries events aggressively; recording each event ID when it is
+    first processed lets the webhook short-circuit duplicate deliveries
+    before doing any user or payment work.
+    """
+    __tablename__ = "processed_stripe_event"
+
+    id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
 
 class PaymentIntent(Base):
@@ -113,16 +174,16 @@ class PaymentIntent(Base):
     
     # Metadata
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    metadata_json: Mapped[Optional[str]] = mapped_column(
+    metadata_json: Mapped[Optional[dict]] = mapped_column(
         "metadata",
-        Text,
+        JSONB,
         nullable=True,
-        comment="JSON string stored as text",
+        comment="Stripe metadata dict stored as JSONB",
     )
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
-    # Relationships
-    order: Mapped["Order"] = relationship("Order", back_populates="payment_intent")
\ No newline at end of file
+    # Relationships; never traversed in app code, so implicit loads raise
+    order: Mapped["Order"] = relationship("Order", back_populates="payment_intent", lazy="raise")
\ No newline at end of file
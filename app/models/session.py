@@ -13,7 +13,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, String, Boolean, ForeignKey, Text
+from sqlalchemy import DateTime, String, Boolean, ForeignKey, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlmodel import SQLModel
 
@@ -54,6 +54,7 @@ class Session(Base):
     
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        server_default=text("now() + interval '7 days'"),
         nullable=False,
         comment="When the session expires"
     )
@@ -85,6 +86,14 @@ class Session(Base):
         nullable=False,
         comment="Whether the session is active"
     )
+
+    kyc_verified: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        nullable=False,
+        index=True,
+        comment="Materialized copy of the user's KYC-verified gate"
+    )
     
     # Optional session data
     session_data: Mapped[Optional[str]] = mapped_column(
@@ -93,14 +102,8 @@ class Session(Base):
         comment="JSON data for session (e.g., permissions, preferences)"
     )
     
-    # Relationship
-    user: Mapped["User"] = relationship(back_populates="sessions")
-
-    def __init__(self, **kwargs):
-        if "expires_at" not in kwargs:
-            # Default session lifetime: 7 days
-            kwargs["expires_at"] = datetime.now(timezone.utc) + timedelta(days=7)
-        super().__init__(**kwargs)
+    # Relationship; never traversed in app code, so implicit loads raise
+    user: Mapped["User"] = relationship(back_populates="sessions", lazy="raise")
     
     @property
     def is_expired(self) -> bool:
@@ -12,14 +12,21 @@ The design separates database concerns (User table) from API concerns
 
 from __future__ import annotations
 import enum
-from typing import Optional
+from functools import cached_property
+from typing import Optional, TYPE_CHECKING
 from uuid import UUID
 
 from fastapi_users import schemas as fus
+from pydantic import ConfigDict
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTableUUID
 from sqlalchemy import Enum
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+if TYPE_CHECKING:
+    from app.models.magic_link import MagicLink
+    from app.models.payment import Order
+    from app.models.session import Session
+
 
 class KYCStatus(str, enum.Enum):
     """Valid KYC verification status values for Stripe Identity."""
@@ -51,28 +58,41 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
         nullable=True,
         comment="Stripe Identity verification session ID for audit trail",
     )
+
+    @cached_property
+    def id_str(self) -> str:
+        """String form of the UUID primary key, built once per instance.
+
+        UUID.__str__ is Python-level and allocates on every call; responses
+        and Stripe metadata stringify the id several times per request.
+        """
+        return str(self.id)
     
-    # Relationships (will be populated after all models are defined)
-    if False:  # Type checking only
-        from app.models.magic_link import MagicLink
-        from app.models.session import Session
-        from app.models.payment import Order
-        magic_links: Mapped[list[MagicLink]] = relationship(
-            back_populates="user",
-            cascade="all, delete-orphan"
-        )
-        sessions: Mapped[list[Session]] = relationship(
-            back_populates="user", 
-            cascade="all, delete-orphan"
-        )
-        orders: Mapped[list[Order]] = relationship(
-            back_populates="user",
-            cascade="all, delete-orphan"
-        )
+    # Relationships (string forward references; configured once by the
+    # registry when all mapped classes have been imported). Nothing in the
+    # app traverses these collections — they exist for cascade behavior —
+    # so lazy="raise" makes any future implicit load a loud failure.
+    magic_links: Mapped[list["MagicLink"]] = relationship(
+        back_populates="user",
+        cascade="all, delete-orphan",
+        lazy="raise"
+    )
+    sessions: Mapped[list["Session"]] = relationship(
+        back_populates="user",
+        cascade="all, delete-orphan",
+        lazy="raise"
+    )
+    orders: Mapped[list["Order"]] = relationship(
+        back_populates="user",
+        cascade="all, delete-orphan",
+        lazy="raise"
+    )
 
 
 class UserRead(fus.BaseUser[UUID]):
     """User data schema for API responses."""
+    model_config = ConfigDict(use_enum_values=True)
+
     kyc_status: KYCStatus
     stripe_verification_session_id: Optional[str] = None
 
@@ -12,18 +12,22 @@ Key Components:
 - Integration with KYC verification flow
 """
 
-import json
+import asyncio
 import logging
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Final, Optional
 from uuid import UUID
 
+import requests
 import stripe
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field
-from sqlalchemy import select
+from requests.adapters import HTTPAdapter
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
+from sqlalchemy import insert, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from app.auth.dependencies import current_active_user
 from app.core.config import get_settings
@@ -31,26 +35,75 @@ from app.db import get_session
 from app.models.user import User
 from app.models.payment import Order, PaymentIntent, OrderStatus, PaymentStatus
 
-router = APIRouter()
+# ORJSONResponse as the router default: list_orders still serializes
+# through the response class, and pinning it here keeps the module fast
+# even if the app-wide default ever changes
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Configure Stripe
 stripe.api_key = settings.stripe_secret.get_secret_value()
 
+# Share one pooled HTTP client across all Stripe calls (process-wide):
+# connection and TLS-session reuse removes the handshake from every
+# PaymentIntent round-trip. 32 pooled connections matches the worst-case
+# to_thread concurrency we expect per worker.
+_stripe_http_session = requests.Session()
+_stripe_http_session.mount(
+    "https://", HTTPAdapter(pool_connections=32, pool_maxsize=32)
+)
+stripe.default_http_client = stripe.http_client.RequestsClient(
+    timeout=10, session=_stripe_http_session
+)
+
+# Pricing configuration in integer cents / micro-tokens: every amount is a
+# fixed multiple of $0.01, so the hot path stays in int arithmetic and
+# Decimal appears only at the column/API boundary. Module-level so the
+# pricing functions hit LOAD_GLOBAL (inline-cached on 3.11+) instead of a
+# class-dict LOAD_ATTR per call.
+_PRICE_PER_TONNE_CENTS: Final = 2000   # $20 per tonne
+_FEE_PER_ORDER_CENTS: Final = 400      # $4 flat fee
+_TOKENS_PER_TONNE_MICRO: Final = 300_000  # 0.3 tokens per tonne, in 1e-6 tokens
+
 
 class OrderRequest(BaseModel):
     """Request schema for creating a new order."""
     tonnes_co2: int = Field(gt=0, le=1000, description="Number of CO2 tonnes to retire")
     eth_address: Optional[str] = Field(
         None,
-        pattern=r"^0x[a-fA-F0-9]{40}$",
-        description="Ethereum address for token delivery",
+        description="Ethereum address for token delivery (0x + 40 hex chars)",
     )
 
+    @field_validator("eth_address")
+    @classmethod
+    def _validate_eth_address(cls, v: Optional[str]) -> Optional[str]:
+        # Fixed-length format: a length check plus C-level hex decoding
+        # replaces the regex engine the old pattern= constraint invoked
+        # per request
+        if v is None:
+            return v
+        if len(v) != 42 or not v.startswith("0x"):
+            raise ValueError("must be an Ethereum address: 0x + 40 hex chars")
+        try:
+            decoded = bytes.fromhex(v[2:])
+        except ValueError:
+            raise ValueError("must be an Ethereum address: 0x + 40 hex chars")
+        # fromhex tolerates ASCII spaces, so confirm all 20 bytes decoded
+        if len(decoded) != 20:
+            raise ValueError("must be an Ethereum address: 0x + 40 hex chars")
+        return v
+
 
 class OrderResponse(BaseModel):
-    """Response schema for order operations."""
+    """Response schema for order operations.
+
+    Documents the wire shape for OpenAPI; the routes emit matching dicts
+    via _order_to_dict, so the columns (not Pydantic) are the schema
+    authority on the way out.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
     order_id: str
     status: OrderStatus
     tonnes_co2: int
@@ -60,6 +113,11 @@ class OrderResponse(BaseModel):
     eth_address: Optional[str] = None
     tokens_to_mint: Optional[Decimal] = None
 
+    @field_serializer("status")
+    def _serialize_status(self, status: OrderStatus) -> str:
+        # Keep the wire format human-readable now that the enum is an int
+        return status.label
+
 
 class PaymentIntentResponse(BaseModel):
     """Response schema for PaymentIntent creation."""
@@ -69,26 +127,90 @@ class PaymentIntentResponse(BaseModel):
     status: PaymentStatus
 
 
+def _order_to_dict(o) -> dict:
+    """Serialize an order row to its response dict.
+
+    Accepts either a hydrated Order or a column Row from list_orders —
+    both expose the same attribute names. One flat dict per order, with
+    DECIMAL columns as floats (matching what jsonable_encoder emitted),
+    ready for orjson with no Pydantic instance in between.
+    """
+    return {
+        "order_id": str(o.id),
+        "status": o.status.label,
+        "tonnes_co2": o.tonnes_co2,
+        "amount_usd": float(o.amount_usd),
+        "fee_usd": float(o.fee_usd),
+        "total_usd": float(o.total_usd),
+        "eth_address": o.eth_address,
+        "tokens_to_mint": float(o.tokens_to_mint) if o.tokens_to_mint is not None else None,
+    }
+
+
 class PaymentService:
     """Service class for payment operations."""
     
-    # Pricing configuration
-    PRICE_PER_TONNE_USD = Decimal("20.00")  # $20 per tonne
-    FEE_PER_ORDER_USD = Decimal("4.00")     # $4 flat fee
-    TOKENS_PER_TONNE = Decimal("0.3")       # 0.3 tokens per tonne
-    
     @staticmethod
-    def calculate_order_amounts(tonnes_co2: int) -> tuple[Decimal, Decimal, Decimal]:
-        """Calculate order amounts: (amount, fee, total)."""
-        amount = PaymentService.PRICE_PER_TONNE_USD * tonnes_co2
-        fee = PaymentService.FEE_PER_ORDER_USD
-        total = amount + fee
-        return amount, fee, total
+    def calculate_order_amounts(tonnes_co2: int) -> tuple[int, int, int]:
+        """Calculate order amounts in cents: (amount, fee, total)."""
+        amount_cents = _PRICE_PER_TONNE_CENTS * tonnes_co2
+        return amount_cents, _FEE_PER_ORDER_CENTS, amount_cents + _FEE_PER_ORDER_CENTS
     
     @staticmethod
     def calculate_tokens_to_mint(tonnes_co2: int) -> Decimal:
         """Calculate number of tokens to mint for the order."""
-        return PaymentService.TOKENS_PER_TONNE * tonnes_co2
+        return Decimal(_TOKENS_PER_TONNE_MICRO * tonnes_co2).scaleb(-6)
+    
+    @staticmethod
+    def _order_values(
+        user: User,
+        tonnes_co2: int,
+        eth_address: Optional[str] = None
+    ) -> dict:
+        """Build the column values for one draft order row.
+
+        Shared by the single-order and bulk creation paths so pricing is
+        computed identically in both. scaleb(-2) shifts the exponent
+        without rounding, converting cents to dollars for the
+        DECIMAL(10, 2) columns in one step.
+        """
+        amount_cents, fee_cents, total_cents = PaymentService.calculate_order_amounts(tonnes_co2)
+        tokens_to_mint = PaymentService.calculate_tokens_to_mint(tonnes_co2) if eth_address else None
+        return {
+            "user_id": user.id,
+            "tonnes_co2": tonnes_co2,
+            "amount_usd": Decimal(amount_cents).scaleb(-2),
+            "fee_usd": Decimal(fee_cents).scaleb(-2),
+            "total_usd": Decimal(total_cents).scaleb(-2),
+            "amount_cents": total_cents,
+            "eth_address": eth_address,
+            "tokens_to_mint": tokens_to_mint,
+            "status": OrderStatus.DRAFT,
+        }
+    
+    @staticmethod
+    async def create_orders_bulk(
+        db: AsyncSession,
+        user: User,
+        order_requests: list[OrderRequest]
+    ):
+        """Create many draft orders in a single round-trip.
+
+        Uses SQLAlchemy's insertmanyvalues: one multi-row
+        INSERT ... RETURNING instead of one INSERT per order. Returns
+        (id, total_usd) rows in input order, for batch callers that do
+        not need hydrated entities.
+        """
+        if not order_requests:
+            return []
+        rows = [
+            PaymentService._order_values(user, req.tonnes_co2, req.eth_address)
+            for req in order_requests
+        ]
+        stmt = insert(Order).returning(Order.id, Order.total_usd)
+        result = await db.execute(stmt, rows)
+        await db.commit()
+        return result.all()
     
     @staticmethod
     async def create_order(
@@ -98,31 +220,21 @@ class PaymentService:
         eth_address: Optional[str] = None
     ) -> Order:
         """Create a new order for CO2 allowance retirement."""
-        amount_usd, fee_usd, total_usd = PaymentService.calculate_order_amounts(tonnes_co2)
-        tokens_to_mint = PaymentService.calculate_tokens_to_mint(tonnes_co2) if eth_address else None
-        
-        order = Order(
-            user_id=user.id,
-            tonnes_co2=tonnes_co2,
-            amount_usd=amount_usd,
-            fee_usd=fee_usd,
-            total_usd=total_usd,
-            eth_address=eth_address,
-            tokens_to_mint=tokens_to_mint,
-            status=OrderStatus.DRAFT
-        )
+        order = Order(**PaymentService._order_values(user, tonnes_co2, eth_address))
         
         db.add(order)
         await db.commit()
-        await db.refresh(order)
         
-        logger.info(
-            "Created order %s for user %s: %d tonnes, $%s total",
-            str(order.id),
-            str(user.id),
-            tonnes_co2,
-            total_usd
-        )
+        # Guarded: the id_str reads are eager argument preparation that
+        # %-formatting cannot defer
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Created order %s for user %s: %d tonnes, $%s total",
+                order.id_str,
+                user.id_str,
+                tonnes_co2,
+                order.total_usd
+            )
         
         return order
     
@@ -133,18 +245,24 @@ class PaymentService:
         user: User
     ) -> PaymentIntent:
         """Create Stripe PaymentIntent with manual capture for the order."""
-        amount_cents = int(order.total_usd * 100)
+        # Cents were fixed at order creation; reading them back avoids any
+        # Decimal arithmetic (and rounding drift) on the payment path
+        amount_cents = order.amount_cents
         
         try:
-            # Create Stripe PaymentIntent
-            stripe_intent = stripe.PaymentIntent.create(
+            # Create Stripe PaymentIntent on a worker thread so the sync
+            # SDK's HTTPS round-trip does not block the event loop; the
+            # idempotency key makes client/network retries safe
+            stripe_intent = await asyncio.to_thread(
+                stripe.PaymentIntent.create,
+                idempotency_key=order.id_str,
                 amount=amount_cents,
                 currency="usd",
                 capture_method="manual",  # Don't capture until after KYC
                 confirmation_method="automatic",
                 metadata={
-                    "order_id": str(order.id),
-                    "user_id": str(user.id),
+                    "order_id": order.id_str,
+                    "user_id": user.id_str,
                     "user_email": user.email,
                     "tonnes_co2": str(order.tonnes_co2),
                 },
@@ -161,38 +279,67 @@ class PaymentService:
                 status=PaymentStatus(stripe_intent.status),
                 capture_method="manual",
                 description=stripe_intent.description,
-                metadata_json=json.dumps(stripe_intent.metadata)
+                # JSONB column: asyncpg serializes the dict natively, so
+                # there is no Python-side json.dumps and no text reparse
+                # on read
+                metadata_json=dict(stripe_intent.metadata)
             )
             
             db.add(payment_intent)
             
-            # Update order status
+            # Update order status; the order is already persistent, so the
+            # unit of work picks up the dirty attribute without re-adding,
+            # and both rows flush in the single commit below
             order.status = OrderStatus.PAYMENT_PENDING
-            db.add(order)
             
             await db.commit()
-            await db.refresh(payment_intent)
             
-            logger.info(
-                "Created PaymentIntent %s for order %s, amount: $%s",
-                stripe_intent.id,
-                str(order.id),
-                order.total_usd
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Created PaymentIntent %s for order %s, amount: $%s",
+                    stripe_intent.id,
+                    order.id_str,
+                    order.total_usd
+                )
             
             return payment_intent
             
         except stripe.StripeError as e:
-            logger.error("Stripe error creating PaymentIntent: %s", str(e))
+            logger.error("Stripe error creating PaymentIntent: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail="Failed to create payment intent"
             )
     
+    @staticmethod
+    async def exists_for_user(db: AsyncSession, order_id: UUID, user_id: UUID) -> bool:
+        """Check that an order exists and belongs to the user.
+
+        Ownership-only companion to get_order_by_id: Postgres returns a
+        single literal int, so no Order entity is hydrated and nothing
+        touches the identity map. Use this for auth-style gates that do
+        not read order fields.
+        """
+        stmt = (
+            select(literal(1))
+            .select_from(Order)
+            .where(Order.id == order_id, Order.user_id == user_id)
+            .limit(1)
+        )
+        result = await db.execute(stmt)
+        return result.scalar() is not None
+    
     @staticmethod
     async def get_order_by_id(db: AsyncSession, order_id: UUID, user_id: UUID) -> Optional[Order]:
         """Get order by ID, ensuring it belongs to the user."""
-        stmt = select(Order).where(Order.id == order_id, Order.user_id == user_id)
+        # raiseload turns any accidental lazy-load of order.user or
+        # order.payment_intent into a loud error instead of a silent
+        # synchronous SELECT inside the async request
+        stmt = (
+            select(Order)
+            .where(Order.id == order_id, Order.user_id == user_id)
+            .options(raiseload("*"))
+        )
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
     
@@ -204,9 +351,10 @@ class PaymentService:
     ) -> bool:
         """Capture a previously authorized PaymentIntent."""
         try:
-            # Capture payment in Stripe
+            # Capture payment in Stripe, off the event loop
             capture_amount = amount_cents or payment_intent.amount_cents
-            stripe_intent = stripe.PaymentIntent.capture(
+            stripe_intent = await asyncio.to_thread(
+                stripe.PaymentIntent.capture,
                 payment_intent.stripe_payment_intent_id,
                 amount_to_capture=capture_amount
             )
@@ -216,19 +364,20 @@ class PaymentService:
             payment_intent.captured_at = datetime.now(timezone.utc)
             payment_intent.captured_amount_cents = capture_amount
             
-            db.add(payment_intent)
             await db.commit()
             
-            logger.info(
-                "Captured PaymentIntent %s for amount $%s",
-                payment_intent.stripe_payment_intent_id,
-                capture_amount / 100
-            )
+            # The division is eager argument preparation; guard it too
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Captured PaymentIntent %s for amount $%s",
+                    payment_intent.stripe_payment_intent_id,
+                    capture_amount / 100
+                )
             
             return True
             
         except stripe.StripeError as e:
-            logger.error("Stripe error capturing payment: %s", str(e))
+            logger.error("Stripe error capturing payment: %s", e)
             return False
 
 
@@ -237,7 +386,7 @@ async def create_order(
     order_request: OrderRequest,
     user: User = Depends(current_active_user),
     db: AsyncSession = Depends(get_session)
-) -> OrderResponse:
+) -> ORJSONResponse:
     """
     Create a new order for CO2 allowance retirement.
     
@@ -251,16 +400,10 @@ async def create_order(
         eth_address=order_request.eth_address
     )
     
-    return OrderResponse(
-        order_id=str(order.id),
-        status=order.status,
-        tonnes_co2=order.tonnes_co2,
-        amount_usd=order.amount_usd,
-        fee_usd=order.fee_usd,
-        total_usd=order.total_usd,
-        eth_address=order.eth_address,
-        tokens_to_mint=order.tokens_to_mint
-    )
+    # Returning a Response directly skips FastAPI's second pass through
+    # the response_model validator (the decorator keeps it for OpenAPI);
+    # values were just written to columns that already enforce the schema
+    return ORJSONResponse(_order_to_dict(order))
 
 
 @router.post("/orders/{order_id}/payment-intent", response_model=PaymentIntentResponse)
@@ -268,7 +411,7 @@ async def create_payment_intent(
     order_id: UUID,
     user: User = Depends(current_active_user),
     db: AsyncSession = Depends(get_session)
-) -> PaymentIntentResponse:
+) -> ORJSONResponse:
     """
     Create Stripe PaymentIntent for an order with manual capture.
     
@@ -283,18 +426,18 @@ async def create_payment_intent(
     if order.status != OrderStatus.DRAFT:
         raise HTTPException(
             status_code=400,
-            detail=f"Order status is {order.status.value}, expected draft"
+            detail=f"Order status is {order.status.label}, expected draft"
         )
     
     # Create PaymentIntent
     payment_intent = await PaymentService.create_payment_intent(db, order, user)
     
-    return PaymentIntentResponse(
-        client_secret=payment_intent.client_secret,
-        order_id=str(order.id),
-        amount_cents=payment_intent.amount_cents,
-        status=payment_intent.status
-    )
+    return ORJSONResponse({
+        "client_secret": payment_intent.client_secret,
+        "order_id": order.id_str,
+        "amount_cents": payment_intent.amount_cents,
+        "status": payment_intent.status.value,
+    })
 
 
 @router.get("/orders/{order_id}", response_model=OrderResponse)
@@ -302,46 +445,44 @@ async def get_order(
     order_id: UUID,
     user: User = Depends(current_active_user),
     db: AsyncSession = Depends(get_session)
-) -> OrderResponse:
+) -> ORJSONResponse:
     """Get order details by ID."""
     order = await PaymentService.get_order_by_id(db, order_id, user.id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    return OrderResponse(
-        order_id=str(order.id),
-        status=order.status,
-        tonnes_co2=order.tonnes_co2,
-        amount_usd=order.amount_usd,
-        fee_usd=order.fee_usd,
-        total_usd=order.total_usd,
-        eth_address=order.eth_address,
-        tokens_to_mint=order.tokens_to_mint
-    )
+    return ORJSONResponse(_order_to_dict(order))
 
 
 @router.get("/orders")
 async def list_orders(
+    limit: int = Query(50, ge=1, le=200, description="Maximum orders to return"),
+    offset: int = Query(0, ge=0, description="Orders to skip from the newest"),
     user: User = Depends(current_active_user),
     db: AsyncSession = Depends(get_session)
-) -> Dict[str, Any]:
-    """List all orders for the authenticated user."""
-    stmt = select(Order).where(Order.user_id == user.id).order_by(Order.created_at.desc())
+) -> ORJSONResponse:
+    """List the authenticated user's orders, newest first, paginated."""
+    # Select only the columns the response needs as plain tuples; skipping
+    # full Order entity construction keeps the per-row cost to one Row
+    stmt = (
+        select(
+            Order.id,
+            Order.status,
+            Order.tonnes_co2,
+            Order.amount_usd,
+            Order.fee_usd,
+            Order.total_usd,
+            Order.eth_address,
+            Order.tokens_to_mint,
+        )
+        .where(Order.user_id == user.id)
+        .order_by(Order.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
     result = await db.execute(stmt)
-    orders = result.scalars().all()
     
-    return {
-        "orders": [
-            OrderResponse(
-                order_id=str(order.id),
-                status=order.status,
-                tonnes_co2=order.tonnes_co2,
-                amount_usd=order.amount_usd,
-                fee_usd=order.fee_usd,
-                total_usd=order.total_usd,
-                eth_address=order.eth_address,
-                tokens_to_mint=order.tokens_to_mint
-            )
-            for order in orders
-        ]
-    }
\ No newline at end of file
+    # Row → dict → orjson, with no OrderResponse instance per row
+    return ORJSONResponse(
+        {"orders": [_order_to_dict(row) for row in result.all()]}
+    )
\ No newline at end of file